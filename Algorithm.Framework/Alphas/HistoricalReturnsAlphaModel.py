@@ -43,8 +43,9 @@ class HistoricalReturnsAlphaModel(AlphaModel):
         Returns:
             The new insights generated'''
         insights = []
+        predictionInterval = self.predictionInterval
 
-        for symbol, symbolData in self.symbolDataBySymbol.items():
+        for symbolData in self.symbolDataBySymbol.values():
             if symbolData.CanEmit:
 
                 direction = InsightDirection.Flat
@@ -52,7 +53,7 @@ class HistoricalReturnsAlphaModel(AlphaModel):
                 if magnitude > 0: direction = InsightDirection.Up
                 if magnitude < 0: direction = InsightDirection.Down
 
-                insights.append(Insight.Price(symbol, self.predictionInterval, direction, magnitude, None))
+                insights.append(Insight.Price(symbolData.Symbol, predictionInterval, direction, magnitude, None))
 
         return insights
 
@@ -73,19 +74,20 @@ class HistoricalReturnsAlphaModel(AlphaModel):
         history = algorithm.History(symbols, self.lookback, self.resolution)
         if history.empty: return
 
-        tickers = history.index.levels[0]
-        for ticker in tickers:
+        for ticker, group in history.groupby(level=0, sort=False):
             symbol = SymbolCache.GetSymbol(ticker)
 
             if symbol not in self.symbolDataBySymbol:
                 symbolData = SymbolData(symbol, self.lookback)
                 self.symbolDataBySymbol[symbol] = symbolData
                 symbolData.RegisterIndicators(algorithm, self.resolution)
-                symbolData.WarmUpIndicators(history.loc[ticker])
+                symbolData.WarmUpIndicators(group.reset_index(level=0, drop=True))
 
 
 class SymbolData:
     '''Contains data specific to a symbol required by this model'''
+    __slots__ = ('Symbol', 'ROC', 'Consolidator', 'previous')
+
     def __init__(self, symbol, lookback):
         self.Symbol = symbol
         self.ROC = RateOfChange('{}.ROC({})'.format(symbol, lookback), lookback)
@@ -101,8 +103,8 @@ class SymbolData:
             algorithm.SubscriptionManager.RemoveConsolidator(self.Symbol, self.Consolidator)
 
     def WarmUpIndicators(self, history):
-        for tuple in history.itertuples():
-            self.ROC.Update(tuple.Index, tuple.close)
+        for time, close in zip(history.index, history['close'].values):
+            self.ROC.Update(time, close)
 
     @property
     def Return(self):
@@ -110,10 +112,11 @@ class SymbolData:
 
     @property
     def CanEmit(self):
-        if self.previous == self.ROC.Samples:
+        samples = self.ROC.Samples
+        if self.previous == samples:
             return False
 
-        self.previous = self.ROC.Samples
+        self.previous = samples
         return self.ROC.IsReady
 
     def __str__(self, **kwargs):
@@ -102,8 +102,9 @@ class RsiAlphaModel(AlphaModel):
                     Log.Trace(f'RsiAlphaModel.OnSecuritiesChanged: {ticker} not found in history data frame.')
                     continue
 
-                for tuple in history.loc[ticker].itertuples():
-                    rsi.Update(tuple.Index, tuple.close)
+                bars = history.loc[ticker]
+                for time, close in zip(bars.index, bars['close'].values):
+                    rsi.Update(time, close)
 
             self.symbolDataBySymbol[symbol] = SymbolData(symbol, rsi)
 
@@ -124,8 +124,10 @@ class StandardDeviationExecutionModel(ExecutionModel):
                 symbol = SymbolCache.GetSymbol(ticker)
                 symbolData = self.symbolData[symbol]
 
-                for tuple in history.loc[ticker].itertuples():
-                    bar = TradeBar(tuple.Index, symbol, tuple.open, tuple.high, tuple.low, tuple.close, tuple.volume)
+                bars = history.loc[ticker]
+                for time, o, h, l, c, v in zip(bars.index, bars['open'].values, bars['high'].values,
+                                               bars['low'].values, bars['close'].values, bars['volume'].values):
+                    bar = TradeBar(time, symbol, o, h, l, c, v)
                     symbolData.Consolidator.Update(bar)
 
     def PriceIsFavorable(self, data, unorderedQuantity):
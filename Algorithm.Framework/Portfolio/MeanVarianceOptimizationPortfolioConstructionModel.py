@@ -135,8 +135,8 @@ class MeanVarianceOptimizationPortfolioConstructionModel(PortfolioConstructionMo
             self.window.Reset()
 
         def WarmUpIndicators(self, history):
-            for tuple in history.itertuples():
-                self.roc.Update(tuple.Index, tuple.close)
+            for time, close in zip(history.index, history['close'].values):
+                self.roc.Update(time, close)
 
         def OnRateOfChangeUpdated(self, roc, value):
             if roc.IsReady:
@@ -20,8 +20,10 @@ AddReference("QuantConnect.Algorithm.Framework")
 from QuantConnect.Data.UniverseSelection import *
 from QuantConnect.Indicators import ExponentialMovingAverage
 from Selection.FundamentalUniverseSelectionModel import FundamentalUniverseSelectionModel
-from itertools import chain
+from collections import defaultdict
 from math import ceil
+from operator import attrgetter
+import heapq
 
 class QC500UniverseSelectionModel(FundamentalUniverseSelectionModel):
     '''Defines the QC500 universe as a universe selection model for framework algorithm
@@ -36,6 +38,7 @@ class QC500UniverseSelectionModel(FundamentalUniverseSelectionModel):
         self.NumberOfSymbolsCoarse = 1000
         self.NumberOfSymbolsFine = 500
         self.lastMonth = -1
+        self.lastFineMonth = -1
         self.dollarVolumeBySymbol = {}
         self.symbols = []
 
@@ -58,11 +61,11 @@ class QC500UniverseSelectionModel(FundamentalUniverseSelectionModel):
         # The stocks must have fundamental data
         # The stock must have positive previous-day close price
         # The stock must have positive volume on the previous trading day
-        filtered = [x for x in coarse if x.HasFundamentalData
+        filtered = (x for x in coarse if x.HasFundamentalData
                                       and x.Volume > 0
-                                      and x.Price > 0]
-        # sort the stocks by dollar volume and take the top 1000
-        top = sorted(filtered, key=lambda x: x.DollarVolume, reverse=True)[:self.NumberOfSymbolsCoarse]
+                                      and x.Price > 0)
+        # take the top 1000 stocks by dollar volume in a single pass
+        top = heapq.nlargest(self.NumberOfSymbolsCoarse, filtered, key=lambda x: x.DollarVolume)
 
         self.dollarVolumeBySymbol = { i.Symbol: i.DollarVolume for i in top }
 
@@ -78,27 +81,56 @@ class QC500UniverseSelectionModel(FundamentalUniverseSelectionModel):
         At least half a year since its initial public offering
         The stock's market cap must be greater than 500 million'''
 
+        # only re-run fine selection after coarse selection has refreshed for a new month
+        if self.lastFineMonth == self.lastMonth:
+            return self.symbols
+
+        fine = list(fine)
+        if len(fine) == 0:
+            return []
+
         # The company's headquarter must in the U.S.
         # The stock must be traded on either the NYSE or NASDAQ
         # At least half a year since its initial public offering
         # The stock's market cap must be greater than 500 million
-        filteredFine = [x for x in fine if x.CompanyReference.CountryId == "USA"
-                                        and (x.CompanyReference.PrimaryExchangeID == "NYS" or x.CompanyReference.PrimaryExchangeID == "NAS")
-                                        and (algorithm.Time - x.SecurityReference.IPODate).days > 180
-                                        and x.EarningReports.BasicAverageShares.ThreeMonths * x.EarningReports.BasicEPS.TwelveMonths * x.ValuationRatios.PERatio > 5e8]
+        now = algorithm.Time
+        filteredFine = []
+        for x in fine:
+            companyReference = x.CompanyReference
+            if companyReference.CountryId != "USA": continue
+            exchange = companyReference.PrimaryExchangeID
+            if exchange != "NYS" and exchange != "NAS": continue
+            if not (now - x.SecurityReference.IPODate).days > 180: continue
+            earningReports = x.EarningReports
+            if not earningReports.BasicAverageShares.ThreeMonths * earningReports.BasicEPS.TwelveMonths * x.ValuationRatios.PERatio > 5e8: continue
+            filteredFine.append(x)
         count = len(filteredFine)
         if count == 0: return []
 
+        self.lastFineMonth = self.lastMonth
+
         myDict = dict()
         percent = float(self.NumberOfSymbolsFine / count)
 
+        # group the stocks by sector in a single pass
+        sectors = defaultdict(list)
+        industryTemplateCode = attrgetter("CompanyReference.IndustryTemplateCode")
+        for x in filteredFine:
+            sectors[industryTemplateCode(x)].append(x)
+
         # select stocks with top dollar volume in every single sector
+        dollarVolumeBySymbol = self.dollarVolumeBySymbol
         for key in ["N", "M", "U", "T", "B", "I"]:
-            value = [x for x in filteredFine if x.CompanyReference.IndustryTemplateCode == key]
-            value = sorted(value, key=lambda x: self.dollarVolumeBySymbol[x.Symbol], reverse = True)
+            value = sectors[key]
+            value.sort(key=lambda x: dollarVolumeBySymbol[x.Symbol], reverse = True)
             myDict[key] = value[:ceil(len(value) * percent)]
 
-        topFine = list(chain.from_iterable(myDict.values()))[:self.NumberOfSymbolsFine]
+        topFine = []
+        limit = self.NumberOfSymbolsFine
+        for value in myDict.values():
+            if len(topFine) >= limit: break
+            topFine.extend(value)
+        del topFine[limit:]
         self.symbols = [f.Symbol for f in topFine]
 
         return self.symbols
@@ -71,6 +71,11 @@ class RebalancingLeveragedETFAlphaModel(AlphaModel):
     def __init__(self, ETFgroups):
 
         self.ETFgroups = ETFgroups
+        self.underlyings = [group.underlying for group in ETFgroups]
+        self.magnitude = 0.0005
+        # Paper suggests leveraged ETF's rebalance from 2.15pm - to close
+        # giving an insight period of 105 minutes.
+        self.period = timedelta(minutes=105)
         self.date = datetime.min.date
         self.Name = "RebalancingLeveragedETFAlphaModel"
 
@@ -78,18 +83,17 @@ class RebalancingLeveragedETFAlphaModel(AlphaModel):
         '''Scan to see if the returns are greater than 1% at 2.15pm to emit an insight.'''
 
         insights = []
-        magnitude = 0.0005
-        # Paper suggests leveraged ETF's rebalance from 2.15pm - to close
-        # giving an insight period of 105 minutes.
-        period = timedelta(minutes=105)
 
         # Get yesterday's close price at the market open
         if algorithm.Time.date() != self.date:
             self.date = algorithm.Time.date()
             # Save yesterday's price and reset the signal
+            # A single batched request for all underlyings instead of one per group
+            history = algorithm.History(self.underlyings, 1, Resolution.Daily)
+            closes = {} if history.empty else history['close'].groupby(level=0).last()
             for group in self.ETFgroups:
-                history = algorithm.History([group.underlying], 1, Resolution.Daily)
-                group.yesterdayClose = None if history.empty else Decimal(history.loc[str(group.underlying)]['close'][0])
+                ticker = str(group.underlying)
+                group.yesterdayClose = Decimal(closes[ticker]) if ticker in closes else None
 
         # Check if the returns are > 1% at 14.15
         if algorithm.Time.hour == 14 and algorithm.Time.minute == 15:
@@ -97,9 +101,9 @@ class RebalancingLeveragedETFAlphaModel(AlphaModel):
                 if group.yesterdayClose == 0 or group.yesterdayClose is None: continue
                 returns = round((algorithm.Portfolio[group.underlying].Price - group.yesterdayClose) / group.yesterdayClose, 10)
                 if returns > 0.01:
-                    insights.append(Insight.Price(group.ultraLong, period, InsightDirection.Up, magnitude))
+                    insights.append(Insight.Price(group.ultraLong, self.period, InsightDirection.Up, self.magnitude))
                 elif returns < -0.01:
-                    insights.append(Insight.Price(group.ultraShort, period, InsightDirection.Down, magnitude))
+                    insights.append(Insight.Price(group.ultraShort, self.period, InsightDirection.Down, self.magnitude))
 
         return insights
 
@@ -111,6 +115,8 @@ class ETFGroup:
         ultraLong: The long-leveraged version of underlying ETF
         ultraShort: The short-leveraged version of the underlying ETF
     '''
+    __slots__ = ('underlying', 'ultraLong', 'ultraShort', 'yesterdayClose')
+
     def __init__(self,underlying, ultraLong, ultraShort):
         self.underlying = underlying
         self.ultraLong = ultraLong
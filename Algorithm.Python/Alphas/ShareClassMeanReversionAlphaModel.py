@@ -16,20 +16,17 @@ AddReference("System")
 AddReference("QuantConnect.Algorithm")
 AddReference("QuantConnect.Algorithm.Framework")
 AddReference("QuantConnect.Common")
-AddReference("QuantConnect.Indicators")
 
 from System import *
 from QuantConnect import *
 from QuantConnect.Algorithm import *
 from QuantConnect.Algorithm.Framework import QCAlgorithmFrameworkBridge
 from QuantConnect.Algorithm.Framework.Alphas import *
-from QuantConnect.Indicators import *
 from QuantConnect.Orders.Fees import ConstantFeeModel
 
 import numpy as np
 import pandas as pd
 from datetime import timedelta, datetime
-from decimal import Decimal
 
 class ShareClassMeanReversionAlphaModel(QCAlgorithmFrameworkBridge):
 
@@ -45,93 +42,129 @@ class ShareClassMeanReversionAlphaModel(QCAlgorithmFrameworkBridge):
         ## e.g., Google
         symbols = ['GOOG','GOOGL']
         
-        self.symbols = symbols
+        self.symbols = []
         for symbol in symbols:
-            self.AddEquity(symbol, Resolution.Minute)
-            self.Securities[symbol].FeeModel = ConstantFeeModel(0) ## Set fees to $0 for High Freq. Trading
+            security = self.AddEquity(symbol, Resolution.Minute)
+            security.FeeModel = ConstantFeeModel(0) ## Set fees to $0 for High Freq. Trading
+            self.symbols.append(security.Symbol)
+        self._s0, self._s1 = self.symbols
         
-        ## Register a 20-bar SMA indicator for tracking the value of the
-        ## long/short position
-        self.sma = SimpleMovingAverage(20)
+        ## (long, short) pairs indexed by whether the position value is at or above its SMA
+        ## Position value below the SMA indicates that we should 'buy our portfolio' since it will revert back to the mean value
+        ## This means go short 'GOOGL' and go long 'GOOG'
+        ## Position value greater than SMA indicates that we should 'sell our portfolio' since it will revert back to the mean value
+        ## This means go long 'GOOGL' and go short 'GOOG'
+        self._sides = ((self._s0, self._s1),
+                       (self._s1, self._s0))
         
-        ## Warm up our 20-bar indicator
-        self.SetWarmup(20)
+        ## Track a 20-bar SMA of the value of the long/short position
+        ## as a running sum over a fixed-size ring buffer
+        self.sma_period = 20
+        self._sma_buf = [0.0] * self.sma_period
+        self._sma_sum = 0.0
+        self._sma_idx = 0
+        self._sma_count = 0
+        self._sma_value = 0.0
         
-        ## Initialize a list to keep track of our position value, a period counter
-        ## to assist in tracking our position relative to the SMA,
-        ## and alpha + beta to represent position sizes in our assets
-        self.portfolio = []
-        self.period_counter = 0
+        ## Keep track of our current and previous position value
+        ## and a flag marking whether a previous bar has reached the trading logic
+        self.prev_pv = None
+        self.curr_pv = None
+        self._has_prior = False
+        
+        ## Fetch the last 20 bars of both share classes in one history request
+        ## so we can size our positions and warm up our SMA in one shot
+        history = self.History(self.symbols, self.sma_period, Resolution.Minute)
+        closes = pd.DataFrame() if history.empty else history['close'].unstack(level=0).dropna()
+        tickers = [str(symbol) for symbol in self.symbols]
+        
+        ## alpha + beta represent position sizes in our assets. Without history for both
+        ## share classes they are sized once from the first live prices instead, and the
+        ## SMA fills from live bars
         self.alpha = None
         self.beta = None
+        if not closes.empty and all(ticker in closes for ticker in tickers):
+            c0, c1 = (closes[ticker].values.astype(np.float64) for ticker in tickers)
+            self._size_positions(c0[-1], c1[-1])
+            self._warm_up_sma(c0, c1)
+        
+        ## Every insight we emit lasts 5 minutes
+        self.insight_period = timedelta(minutes=5)
 
     def OnData(self, data):
         
+        s0, s1 = self._s0, self._s1
+        
         ## If one or more of the symbols doesn't have a TradeBar for a given slice, then
         ## skip this slice and do nothing until both symbols have data
-        for symbol in self.symbols:
-            if not data.Bars.ContainsKey(symbol): return
+        bars = data.Bars
+        bar0 = bars.GetValue(s0)
+        bar1 = bars.GetValue(s1)
+        if bar0 is None or bar1 is None: return
+        c0 = float(bar0.Close)
+        c1 = float(bar1.Close)
         
-        ## We want to calculate alpha and beta such that our position in each asset
-        ## is 50% of our total available cash.
-        if (self.alpha is None) and (self.beta is None):
-            self.alpha = self.CalculateOrderQuantity(self.symbols[0], 0.5)
-            self.beta = self.CalculateOrderQuantity(self.symbols[1], 0.5)
+        ## Calculate our position value here, which we then use to update the SMA
+        is_ready = self._sma_count >= self.sma_period
+        if not is_ready and self.alpha is None:
+            self._size_positions(float(self.Securities[s0].Price), float(self.Securities[s1].Price))
+        position_value = (self.alpha * c0) - (self.beta * c1)
+        self._sma_update(position_value)
+        self.prev_pv, self.curr_pv = self.curr_pv, position_value
 
-        ## We want to keep updating the SMA indicator and our own position
-        ## value list while the algorithm is warming-up
-        if not self.sma.IsReady:
-            position_value = (self.alpha * data[self.symbols[0]].Close) - (self.beta * data[self.symbols[1]].Close)
-            self.sma.Update(data[self.symbols[0]].EndTime, position_value)
-            self.portfolio.append(position_value)
+        ## We only keep updating the SMA and our own position
+        ## values while the algorithm is warming-up
+        if not is_ready:
             return
-
-        ## Calculate our position value here, which we then use to update the SMA
-        position_value = (self.alpha * data[self.symbols[0]].Close) - (self.beta * data[self.symbols[1]].Close)
-        self.sma.Update(data[self.symbols[0]].EndTime, position_value)
-        self.portfolio.append(position_value)
         
         ## Check to see if the position has crossed over the SMA before we liquidate
         ## our positions. This prevents immediate liquidation of a position after entering it
-        if self.period_counter >= 1:
-            torf = self.crossed_mean()
-        else:
-            torf = True
-            self.period_counter += 1
+        torf = self.crossed_mean() if self._has_prior else True
+        self._has_prior = True
         
         if not self.Portfolio.Invested:
-            ## Position value greater than SMA indicates that we should 'sell our portfolio' since it will revert back to the mean value
-            ## This means go long 'GOOGL' and go short 'GOOG'
-            if position_value >= self.sma.Current.Value:
-                insight1 = Insight.Price(self.symbols[1], timedelta(minutes=5), InsightDirection.Up)
-                insight2 = Insight.Price(self.symbols[0], timedelta(minutes=5), InsightDirection.Down)
-                self.EmitInsights( Insight.Group ( [insight1, insight2] ) )
-                
-                self.SetHoldings(self.symbols[1], 0.5)
-                self.SetHoldings(self.symbols[0], -0.5)
-                
-            ## Position value greater than SMA indicates that we should 'buy our portfolio' since it will revert back to the mean value
-            ## This means go short 'GOOGL' and go long 'GOOG'
-            elif position_value < self.sma.Current.Value:
-                insight1 = Insight.Price(self.symbols[1], timedelta(minutes=5), InsightDirection.Down)
-                insight2 = Insight.Price(self.symbols[0], timedelta(minutes=5), InsightDirection.Up)
-                self.EmitInsights( Insight.Group ( [insight1, insight2] ) )
-                
-                self.SetHoldings(self.symbols[1], -0.5)
-                self.SetHoldings(self.symbols[0], 0.5)
+            ## Pick the (long, short) pair by which side of the SMA the position value is on
+            long_symbol, short_symbol = self._sides[position_value >= self._sma_value]
+            self._emit_pair(long_symbol, short_symbol)
+            
+            self.SetHoldings(long_symbol, 0.5)
+            self.SetHoldings(short_symbol, -0.5)
         
         ## If we are invested and the long/short position has crossed the SMA line, then we close our positions
         elif self.Portfolio.Invested and torf:
             self.Liquidate()
     
-    ## Helper function to check if the long/short position has crossed the SMA        
+    ## Helper function to emit a grouped pair of insights, long one symbol and short the other
+    def _emit_pair(self, long_symbol, short_symbol):
+        insight1 = Insight.Price(long_symbol, self.insight_period, InsightDirection.Up)
+        insight2 = Insight.Price(short_symbol, self.insight_period, InsightDirection.Down)
+        self.EmitInsights( Insight.Group ( [insight1, insight2] ) )
+    
+    ## Helper function to calculate alpha and beta such that our position
+    ## in each asset is 50% of our total available cash
+    def _size_positions(self, price0, price1):
+        cash = float(self.Portfolio.Cash)
+        self.alpha = float(int(0.5 * cash / price0))
+        self.beta = float(int(0.5 * cash / price1))
+    
+    ## Helper function to seed the SMA from historical closes of both share classes
+    def _warm_up_sma(self, c0, c1):
+        for position_value in ((self.alpha * c0) - (self.beta * c1)).tolist():
+            self._sma_update(position_value)
+            self.prev_pv, self.curr_pv = self.curr_pv, position_value
+    
+    ## Helper function to add a position value to the SMA in O(1)
+    def _sma_update(self, value):
+        idx = self._sma_idx
+        self._sma_sum += value - self._sma_buf[idx]
+        self._sma_buf[idx] = value
+        self._sma_idx = (idx + 1) % self.sma_period
+        if self._sma_count < self.sma_period:
+            self._sma_count += 1
+        if self._sma_count == self.sma_period:
+            self._sma_value = self._sma_sum / self.sma_period
+    
+    ## Helper function to check if the long/short position has crossed the SMA
     def crossed_mean(self):
-        if (self.portfolio[self.period_counter] >= self.sma.Current.Value) and (self.portfolio[self.period_counter-1] < self.sma.Current.Value):
-            self.period_counter += 1
-            return True
-        elif (self.portfolio[self.period_counter] < self.sma.Current.Value) and (self.portfolio[self.period_counter-1] >= self.sma.Current.Value):
-            self.period_counter += 1
-            return True
-        else:
-            self.period_counter += 1
-            return False
\ No newline at end of file
+        mean = self._sma_value
+        return (self.curr_pv >= mean) != (self.prev_pv >= mean)